@@ -4,8 +4,11 @@ Main orchestrator for Atlan S3 Connector
 Handles the complete workflow: Discovery → Cataloging → Lineage → AI Enhancement
 """
 
+import atexit
 import logging
+import logging.handlers
 import asyncio
+import queue
 import time
 from typing import List, Dict, Optional
 from dataclasses import asdict
@@ -19,15 +22,26 @@ from pii_inventory import PIIInventoryManager
 from utils import AtlanUtils, PerformanceMonitor
 from pyatlan.model.assets import Process
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('atlan_s3_connector.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging. Records are queued and written to the file and console by a
+# background listener thread, so logging never blocks the pipeline on I/O.
+_log_handlers = [
+    logging.FileHandler('atlan_s3_connector.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# Only the message is rendered on the queue side; the listener's handlers apply the full format
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+# Flush queued records before the interpreter exits
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 class AtlanS3Pipeline:
@@ -3,8 +3,12 @@
 AI Enhancer for the Flask UI, with added UI-specific methods.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+import os
+import string
+import threading
+from typing import List, Dict, Any, Tuple
 import google.generativeai as genai
 
 # Since this file is in a subdirectory, we need to handle imports carefully.
@@ -17,6 +21,88 @@ import json
 
 # ... (imports)
 
+# One configured Gemini model per (api_key, model name), shared by every AIEnhancer
+# instance so per-request construction in the Flask app does not redo client setup.
+_model_cache: Dict[Tuple[str, str], genai.GenerativeModel] = {}
+
+# Caps in-flight Gemini requests across the whole process. Flask runs every async
+# view on its own event loop, so a thread-level semaphore (acquired off the loop)
+# is used rather than an asyncio.Semaphore bound to a single loop.
+_GEMINI_SEM = threading.BoundedSemaphore(int(os.getenv("GEMINI_MAX_CONCURRENCY", "16")))
+
+# Descriptions for self-explanatory column names, keyed by lower-cased name.
+# These columns are answered directly instead of being sent to Gemini.
+_DEFAULT_DESCRIPTIONS = {
+    "id": "Primary key identifier for the record.",
+    "uuid": "Universally unique identifier for the record.",
+    "created_at": "Timestamp when the record was created.",
+    "updated_at": "Timestamp when the record was last updated.",
+    "deleted_at": "Timestamp when the record was deleted, if applicable.",
+    "created_by": "User who created the record.",
+    "updated_by": "User who last updated the record.",
+    "email": "Email address associated with the record.",
+    "phone": "Phone number associated with the record.",
+}
+
+# Prompt templates are built once at import time and filled per request.
+_ASSET_TEMPLATE = string.Template("""
+        As a senior data analyst, your task is to write a clear, business-friendly description for a data asset.
+        
+        Here's information about the asset:
+        $context
+        
+        Generate a concise (2-3 sentences) but informative description that explains:
+        1. What this asset likely contains
+        2. Its potential business purpose
+        3. How it might be used in analytics or operations
+        
+        The description should be professional and helpful for data users who need to understand this asset.
+        
+        Description:
+        """)
+
+_GLOSSARY_CATEGORY_TEMPLATE = string.Template("""
+            As a business analyst and data governance expert, create a comprehensive README for a business glossary category.
+            
+            Category Name: $item_name
+            Current Description: $description
+            
+            Generate a well-structured README in markdown format that includes:
+            
+            1. **Overview** - What this category represents in the business context
+            2. **Purpose** - Why this category exists and its business value
+            3. **Scope** - What types of terms belong in this category
+            4. **Usage Guidelines** - How teams should use terms from this category
+            5. **Related Categories** - How this category relates to other business areas
+            6. **Governance** - Who maintains this category and approval processes
+            
+            The README should be professional, clear, and help business users understand when and how to use terms from this category.
+            
+            README Content:
+            """)
+
+_GLOSSARY_TERM_TEMPLATE = string.Template("""
+            As a business analyst and data governance expert, create a comprehensive README for a business glossary term.
+            
+            Term Name: $item_name
+            Current Description: $description
+            
+            Generate a well-structured README in markdown format that includes:
+            
+            1. **Definition** - Clear, business-friendly definition of this term
+            2. **Business Context** - How this term is used in business operations
+            3. **Data Context** - How this term relates to data assets and fields
+            4. **Usage Examples** - Practical examples of when to use this term
+            5. **Related Terms** - Other glossary terms that are related or similar
+            6. **Calculation/Rules** - If applicable, how this term is calculated or determined
+            7. **Data Sources** - Where data for this term typically comes from
+            8. **Governance** - Who owns this term and approval processes for changes
+            
+            The README should help both business and technical users understand exactly what this term means and how to use it consistently.
+            
+            README Content:
+            """)
+
 class AIEnhancer:
     """
     A class to handle AI-powered enhancements, specifically for the Flask UI.
@@ -31,8 +117,21 @@ class AIEnhancer:
                 "Please ensure the GOOGLE_API_KEY in flask_app/.env is set to a valid key."
             )
         
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(config.gemini_model)
+        key = (api_key, config.gemini_model)
+        if key not in _model_cache:
+            genai.configure(api_key=api_key)
+            _model_cache[key] = genai.GenerativeModel(config.gemini_model)
+        self.model = _model_cache[key]
+
+    async def _generate_content(self, prompt: str):
+        """
+        Calls Gemini while holding one of the process-wide concurrency slots.
+        """
+        await asyncio.to_thread(_GEMINI_SEM.acquire)
+        try:
+            return await self.model.generate_content_async(prompt)
+        finally:
+            _GEMINI_SEM.release()
 
     async def generate_asset_description(self, payload: Dict[str, Any]) -> str:
         """
@@ -50,7 +149,7 @@ class AIEnhancer:
         logger.info(f"Generating description for asset: {asset_name} (type: {asset_type})")
         
         # Build context for the prompt based on asset type
-        context = f"Asset name: {asset_name}\nAsset type: {asset_type}\n"
+        parts = [f"Asset name: {asset_name}\n", f"Asset type: {asset_type}\n"]
         
         # Add schema information for S3 objects
         if asset_type == 's3' and 'schema_info' in payload:
@@ -58,36 +157,23 @@ class AIEnhancer:
             columns = schema_info.get('columns', [])
             
             if columns:
-                context += f"\nThis is a CSV file with {len(columns)} columns:\n"
+                parts.append(f"\nThis is a CSV file with {len(columns)} columns:\n")
                 for col in columns:
                     col_name = col.get('name', 'Unknown')
                     col_type = col.get('type', 'Unknown')
                     sample_values = col.get('sample_values', [])
                     
-                    context += f"- {col_name} ({col_type})"
+                    parts.append(f"- {col_name} ({col_type})")
                     if sample_values:
                         samples = ', '.join([str(s) for s in sample_values[:3]])
-                        context += f" - Sample values: {samples}"
-                    context += "\n"
-        
-        prompt = f"""
-        As a senior data analyst, your task is to write a clear, business-friendly description for a data asset.
-        
-        Here's information about the asset:
-        {context}
-        
-        Generate a concise (2-3 sentences) but informative description that explains:
-        1. What this asset likely contains
-        2. Its potential business purpose
-        3. How it might be used in analytics or operations
-        
-        The description should be professional and helpful for data users who need to understand this asset.
+                        parts.append(f" - Sample values: {samples}")
+                    parts.append("\n")
         
-        Description:
-        """
+        context = "".join(parts)
+        prompt = _ASSET_TEMPLATE.substitute(context=context)
         
         try:
-            response = await self.model.generate_content_async(prompt)
+            response = await self._generate_content(prompt)
             description = response.text.strip()
             
             logger.info(f"Successfully generated description for {asset_name}")
@@ -103,45 +189,64 @@ class AIEnhancer:
         """
         logger.info(f"Generating descriptions for {len(payload['columns'])} columns in asset {payload['asset_qualified_name']}.")
 
-        column_names = [col['name'] for col in payload['columns']]
+        # Answer self-explanatory columns from the defaults and only send the rest to Gemini
+        known_descriptions = []
+        column_names = []
+        for col in payload['columns']:
+            default_description = _DEFAULT_DESCRIPTIONS.get(col['name'].lower())
+            if default_description:
+                known_descriptions.append({"name": col['name'], "description": default_description})
+            else:
+                column_names.append(col['name'])
+        
+        if not column_names:
+            return known_descriptions
+        
+        column_list = ', '.join(column_names)
         table_name = payload['asset_qualified_name'].split('/')[-1]
 
         prompt = f"""
         As a senior data analyst, your task is to write a clear, business-friendly description for each database column.
         The table is named '{table_name}'.
         
-        Generate a concise (under 15 words) description for each of the following columns: {', '.join(column_names)}
+        Generate a concise (under 15 words) description for each of the following columns: {column_list}
 
-        Return the output as a single, valid JSON object where the keys are the exact column names and the values are the descriptions.
-        Example format:
-        {{
-          "COLUMN_NAME_1": "Description for column 1.",
-          "COLUMN_NAME_2": "Description for column 2."
-        }}
+        Return one JSON object per line (NDJSON), one line per column, using the exact column name.
+        Do not wrap the output in markdown. Example format:
+        {{"name": "COLUMN_NAME_1", "description": "Description for column 1."}}
+        {{"name": "COLUMN_NAME_2", "description": "Description for column 2."}}
         
-        JSON object:
+        Output:
         """
 
         try:
-            response = await self.model.generate_content_async(prompt)
-            
-            # Clean the response to extract only the JSON part
-            cleaned_response = response.text.strip().replace('```json', '').replace('```', '').strip()
-            
-            descriptions_map = json.loads(cleaned_response)
+            response = await self._generate_content(prompt)
             
+            # Parse line by line so one malformed line does not discard the rest
             generated_descriptions = []
-            for col_name, description in descriptions_map.items():
-                generated_descriptions.append({
-                    "name": col_name,
-                    "description": description
-                })
+            for line in response.text.splitlines():
+                line = line.strip()
+                if not line or not line.startswith('{'):
+                    continue
+                try:
+                    obj = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unparseable AI description line: {line}")
+                    continue
+                if isinstance(obj, dict) and 'name' in obj and 'description' in obj:
+                    generated_descriptions.append({
+                        "name": obj['name'],
+                        "description": obj['description']
+                    })
+            
+            if not generated_descriptions:
+                raise ValueError("No column descriptions could be parsed from the AI response")
             
-            return generated_descriptions
+            return known_descriptions + generated_descriptions
 
         except Exception as e:
             logger.error(f"Failed to generate or parse AI descriptions: {e}")
-            return [{"name": col['name'], "description": f"Error during AI generation: {e}"} for col in payload['columns']]
+            return known_descriptions + [{"name": name, "description": f"Error during AI generation: {e}"} for name in column_names]
 
     async def generate_glossary_readme(self, payload: Dict[str, Any]) -> str:
         """
@@ -160,51 +265,14 @@ class AIEnhancer:
         logger.info(f"Generating README for glossary {item_type}: {item_name}")
         
         # Build context based on item type
-        if item_type == 'category':
-            prompt = f"""
-            As a business analyst and data governance expert, create a comprehensive README for a business glossary category.
-            
-            Category Name: {item_name}
-            Current Description: {description if description else 'No description provided'}
-            
-            Generate a well-structured README in markdown format that includes:
-            
-            1. **Overview** - What this category represents in the business context
-            2. **Purpose** - Why this category exists and its business value
-            3. **Scope** - What types of terms belong in this category
-            4. **Usage Guidelines** - How teams should use terms from this category
-            5. **Related Categories** - How this category relates to other business areas
-            6. **Governance** - Who maintains this category and approval processes
-            
-            The README should be professional, clear, and help business users understand when and how to use terms from this category.
-            
-            README Content:
-            """
-        else:  # term
-            prompt = f"""
-            As a business analyst and data governance expert, create a comprehensive README for a business glossary term.
-            
-            Term Name: {item_name}
-            Current Description: {description if description else 'No description provided'}
-            
-            Generate a well-structured README in markdown format that includes:
-            
-            1. **Definition** - Clear, business-friendly definition of this term
-            2. **Business Context** - How this term is used in business operations
-            3. **Data Context** - How this term relates to data assets and fields
-            4. **Usage Examples** - Practical examples of when to use this term
-            5. **Related Terms** - Other glossary terms that are related or similar
-            6. **Calculation/Rules** - If applicable, how this term is calculated or determined
-            7. **Data Sources** - Where data for this term typically comes from
-            8. **Governance** - Who owns this term and approval processes for changes
-            
-            The README should help both business and technical users understand exactly what this term means and how to use it consistently.
-            
-            README Content:
-            """
+        template = _GLOSSARY_CATEGORY_TEMPLATE if item_type == 'category' else _GLOSSARY_TERM_TEMPLATE
+        prompt = template.substitute(
+            item_name=item_name,
+            description=description if description else 'No description provided'
+        )
         
         try:
-            response = await self.model.generate_content_async(prompt)
+            response = await self._generate_content(prompt)
             readme_content = response.text.strip()
             
             logger.info(f"Successfully generated README for {item_type}: {item_name}")
@@ -4,6 +4,7 @@ PII Classification and Inventory Management for Atlan S3 Connector
 Provides advanced PII detection, CIA rating application, and inventory reporting
 """
 
+import asyncio
 import logging
 import json
 from typing import Dict, List, Any, Optional, Tuple
@@ -16,6 +17,9 @@ from pyatlan.client.atlan import AtlanClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of lineage neighbours fetched and updated concurrently
+MAX_CONCURRENT_PROPAGATIONS = 16
+
 class ConfidentialityLevel(Enum):
     """Confidentiality levels for CIA ratings"""
     LOW = "Low"
@@ -352,57 +356,49 @@ class PIIClassifier:
         }
         
         try:
-            # Get lineage relationships for this asset
-            lineage = self.atlan_client.lineage.get_lineage(
+            # Get lineage relationships for this asset; the SDK is blocking, so its
+            # calls run in worker threads instead of on the event loop
+            lineage = await asyncio.to_thread(
+                self.atlan_client.lineage.get_lineage,
                 guid=asset_guid,
                 direction="BOTH",
                 depth=1
             )
             
-            # Process upstream assets
-            for upstream_asset in lineage.get_upstream_assets():
-                try:
-                    # Get the full asset to update
-                    full_asset = self.atlan_client.asset.get_by_guid(upstream_asset.guid)
-                    
-                    # Apply the same classification
-                    self.apply_classification_to_asset(full_asset, classification)
-                    
-                    results["propagated_to"].append({
-                        "guid": upstream_asset.guid,
-                        "name": upstream_asset.name,
-                        "type": upstream_asset.type_name,
-                        "direction": "upstream"
-                    })
-                except Exception as e:
-                    results["failed"].append({
-                        "guid": upstream_asset.guid,
-                        "name": upstream_asset.name,
-                        "error": str(e),
-                        "direction": "upstream"
-                    })
+            related_assets = [(asset, "upstream") for asset in lineage.get_upstream_assets()]
+            related_assets += [(asset, "downstream") for asset in lineage.get_downstream_assets()]
+            
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROPAGATIONS)
+            
+            async def _propagate(related_asset: Asset) -> None:
+                async with semaphore:
+                    # Get the full asset, then save the same classification onto it
+                    full_asset = await asyncio.to_thread(self.atlan_client.asset.get_by_guid, related_asset.guid)
+                    await asyncio.to_thread(self.apply_classification_to_asset, full_asset, classification)
             
-            # Process downstream assets
-            for downstream_asset in lineage.get_downstream_assets():
+            # Update the upstream and downstream assets concurrently
+            outcomes = await asyncio.gather(
+                *(_propagate(asset) for asset, _ in related_assets),
+                return_exceptions=True
+            )
+            
+            for (related_asset, direction), outcome in zip(related_assets, outcomes):
                 try:
-                    # Get the full asset to update
-                    full_asset = self.atlan_client.asset.get_by_guid(downstream_asset.guid)
-                    
-                    # Apply the same classification
-                    self.apply_classification_to_asset(full_asset, classification)
+                    if isinstance(outcome, Exception):
+                        raise outcome
                     
                     results["propagated_to"].append({
-                        "guid": downstream_asset.guid,
-                        "name": downstream_asset.name,
-                        "type": downstream_asset.type_name,
-                        "direction": "downstream"
+                        "guid": related_asset.guid,
+                        "name": related_asset.name,
+                        "type": related_asset.type_name,
+                        "direction": direction
                     })
                 except Exception as e:
                     results["failed"].append({
-                        "guid": downstream_asset.guid,
-                        "name": downstream_asset.name,
+                        "guid": related_asset.guid,
+                        "name": related_asset.name,
                         "error": str(e),
-                        "direction": "downstream"
+                        "direction": direction
                     })
             
             return results
@@ -6,17 +6,124 @@ Provides comprehensive inventory reporting of PII data across the pipeline
 
 import logging
 import json
+import csv
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import pandas as pd
 import os
+import queue
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 from pyatlan.model.assets import Asset, Table, Column, S3Object
 from pyatlan.model.fluent_search import FluentSearch
+from pyatlan.model.fields.atlan_fields import CustomMetadataField
 from pyatlan.client.atlan import AtlanClient
+from pyatlan.errors import NotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Column order for sensitive_assets.csv
+SENSITIVE_ASSET_FIELDS = [
+    "name",
+    "qualified_name",
+    "type",
+    "source",
+    "sensitivity_level",
+    "pii_types",
+    "cia_rating",
+    "compliance_tags",
+    "sensitive_columns"
+]
+_NESTED_SENSITIVE_ASSET_FIELDS = ("pii_types", "cia_rating", "compliance_tags", "sensitive_columns")
+
+# Custom metadata sets read from each asset in the inventory
+_CUSTOM_METADATA_SETS = ("PIIClassification", "CIARating")
+
+# Page size for inventory searches, and how many pages may be buffered ahead
+_SEARCH_PAGE_SIZE = 500
+_PREFETCH_PAGES = 2
+
+_END_OF_RESULTS = object()
+
+# How often (seconds) a blocked prefetch thread checks whether the consumer has stopped
+_PREFETCH_PUT_TIMEOUT = 0.5
+
+# How long (seconds) a generated report is reused for dashboard views
+_REPORT_TTL = 60.0
+
+# PII types tracked in the "by_pii_type" section of the report
+_PII_TYPES = frozenset({"email", "phone", "name", "address", "id", "financial", "health", "biometric"})
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(value, default=str).encode()
+
+def _prefetch(results, maxsize: int):
+    """
+    Iterate over search results while a background thread fetches ahead
+    
+    The producer thread drives pyatlan's pagination so the next page is being
+    retrieved while the caller processes the current one. If the caller stops
+    early (an exception or closing the generator), the producer is told to stop
+    so it does not block forever on a full buffer.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PREFETCH_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _produce():
+        try:
+            for item in results:
+                if not _put(item):
+                    return
+        except Exception as e:
+            _put(e)
+            return
+        _put(_END_OF_RESULTS)
+    
+    threading.Thread(target=_produce, daemon=True).start()
+    
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_RESULTS:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+@lru_cache(maxsize=64)
+def _source_for_prefix(head: str) -> str:
+    """Map a qualified-name connection prefix to its source system (few distinct prefixes, so cached)"""
+    head = head.lower()
+    if "postgres" in head:
+        return "postgres"
+    elif "snowflake" in head:
+        return "snowflake"
+    elif "s3" in head:
+        return "s3"
+    else:
+        return "unknown"
+
 class PIIInventoryManager:
     """
     Manages PII inventory across the data pipeline
@@ -24,13 +131,16 @@ class PIIInventoryManager:
     
     def __init__(self, atlan_client: AtlanClient):
         self.atlan_client = atlan_client
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._last_report_at = 0.0
     
-    async def generate_inventory_report(self, output_format: str = "json") -> Dict[str, Any]:
+    async def generate_inventory_report(self, output_format: str = "json", save: bool = True) -> Dict[str, Any]:
         """
         Generate a comprehensive inventory report of PII data across the pipeline
         
         Args:
             output_format: Format for the report ("json" or "csv")
+            save: Whether to write the report to disk
             
         Returns:
             Dictionary containing the PII inventory report
@@ -78,58 +188,81 @@ class PIIInventoryManager:
         try:
             # Search for S3 objects with PII classification
             s3_assets = await self._get_assets_with_pii_classification(S3Object)
-            report["by_source"]["s3"]["total"] = len(s3_assets)
-            report["by_source"]["s3"]["with_pii"] = sum(1 for asset in s3_assets if asset.get("has_pii", False))
+            report["by_source"]["s3"]["total"] = await self._count_assets(S3Object)
+            report["by_source"]["s3"]["with_pii"] = len(s3_assets)
             
             # Search for PostgreSQL tables with PII classification
             postgres_assets = await self._get_assets_with_pii_classification(Table, source_filter="postgres")
-            report["by_source"]["postgres"]["total"] = len(postgres_assets)
-            report["by_source"]["postgres"]["with_pii"] = sum(1 for asset in postgres_assets if asset.get("has_pii", False))
+            report["by_source"]["postgres"]["total"] = await self._count_assets(Table, source_filter="postgres")
+            report["by_source"]["postgres"]["with_pii"] = len(postgres_assets)
             
             # Search for Snowflake tables with PII classification
             snowflake_assets = await self._get_assets_with_pii_classification(Table, source_filter="snowflake")
-            report["by_source"]["snowflake"]["total"] = len(snowflake_assets)
-            report["by_source"]["snowflake"]["with_pii"] = sum(1 for asset in snowflake_assets if asset.get("has_pii", False))
+            report["by_source"]["snowflake"]["total"] = await self._count_assets(Table, source_filter="snowflake")
+            report["by_source"]["snowflake"]["with_pii"] = len(snowflake_assets)
             
-            # Combine all assets
+            # Combine all assets (only PII-classified assets are fetched from Atlan)
             all_assets = s3_assets + postgres_assets + snowflake_assets
+            total_assets_scanned = sum(source["total"] for source in report["by_source"].values())
             
-            # Update summary statistics
-            report["summary"]["total_assets_scanned"] = len(all_assets)
-            report["summary"]["assets_with_pii"] = sum(1 for asset in all_assets if asset.get("has_pii", False))
-            report["summary"]["high_sensitivity_assets"] = sum(1 for asset in all_assets if asset.get("sensitivity_level") in ["High", "Restricted"])
-            report["summary"]["medium_sensitivity_assets"] = sum(1 for asset in all_assets if asset.get("sensitivity_level") == "Medium")
-            report["summary"]["low_sensitivity_assets"] = sum(1 for asset in all_assets if asset.get("sensitivity_level") == "Low")
-            
-            # Update PII type counts
-            for asset in all_assets:
-                if asset.get("has_pii", False):
-                    for pii_type in asset.get("pii_types", []):
-                        if pii_type.lower() in report["by_pii_type"]:
-                            report["by_pii_type"][pii_type.lower()] += 1
-            
-            # Add sensitive assets to the report
+            # Build the sensitive asset list and the columns to count in a single pass;
+            # the counting itself is done by Counter over the collected columns
+            sensitivity_levels = []
+            pii_type_values = []
+            sensitive_assets = report["sensitive_assets"]
+
             for asset in all_assets:
-                if asset.get("has_pii", False):
-                    sensitive_asset = {
-                        "name": asset.get("name", ""),
-                        "qualified_name": asset.get("qualified_name", ""),
-                        "type": asset.get("type_name", ""),
-                        "source": self._determine_source(asset.get("qualified_name", "")),
-                        "sensitivity_level": asset.get("sensitivity_level", "Low"),
-                        "pii_types": asset.get("pii_types", []),
-                        "cia_rating": asset.get("cia_rating", {}),
-                        "compliance_tags": asset.get("compliance_tags", []),
-                        "sensitive_columns": asset.get("sensitive_columns", [])
-                    }
-                    report["sensitive_assets"].append(sensitive_asset)
-            
+                sensitivity_levels.append(asset.get("sensitivity_level"))
+
+                if not asset.get("has_pii", False):
+                    continue
+
+                pii_types = asset.get("pii_types", [])
+                pii_type_values.extend(pii_type.lower() for pii_type in pii_types)
+
+                qualified_name = asset.get("qualified_name", "")
+                sensitive_assets.append({
+                    "name": asset.get("name", ""),
+                    "qualified_name": qualified_name,
+                    "type": asset.get("type_name", ""),
+                    "source": self._determine_source(qualified_name),
+                    "sensitivity_level": asset.get("sensitivity_level", "Low"),
+                    "pii_types": pii_types,
+                    "cia_rating": asset.get("cia_rating", {}),
+                    "compliance_tags": asset.get("compliance_tags", []),
+                    "sensitive_columns": asset.get("sensitive_columns", [])
+                })
+
+            level_counts = Counter(sensitivity_levels)
+            assets_with_pii = len(sensitive_assets)
+            high = level_counts["High"] + level_counts["Restricted"]
+            medium = level_counts["Medium"]
+            low = level_counts["Low"]
+
+            pii_bucket = report["by_pii_type"]
+            for pii_type, count in Counter(pii_type_values).items():
+                if pii_type in _PII_TYPES:
+                    pii_bucket[pii_type] += count
+
+            # Assets without PII are not fetched; they default to low sensitivity
+            low += max(total_assets_scanned - assets_with_pii, 0)
+
+            summary = report["summary"]
+            summary["total_assets_scanned"] = total_assets_scanned
+            summary["assets_with_pii"] = assets_with_pii
+            summary["high_sensitivity_assets"] = high
+            summary["medium_sensitivity_assets"] = medium
+            summary["low_sensitivity_assets"] = low
+
             # Generate output in requested format
-            if output_format.lower() == "csv":
-                self._save_report_as_csv(report)
-            else:
-                self._save_report_as_json(report)
+            if save:
+                if output_format.lower() == "csv":
+                    self._save_report_as_csv(report)
+                else:
+                    self._save_report_as_json(report)
             
+            self._last_report = report
+            self._last_report_at = time.monotonic()
             return report
             
         except Exception as e:
@@ -139,6 +272,62 @@ class PIIInventoryManager:
                 "generated_at": datetime.now().isoformat()
             }
     
+    async def _get_report(self, save: bool = False) -> Dict[str, Any]:
+        """
+        Return the last generated report if it is still fresh, otherwise regenerate it
+        
+        Args:
+            save: Whether to write a regenerated report to disk
+            
+        Returns:
+            Dictionary containing the PII inventory report
+        """
+        if self._last_report is not None and time.monotonic() - self._last_report_at < _REPORT_TTL:
+            return self._last_report
+        
+        return await self.generate_inventory_report(save=save)
+    
+    def _build_asset_search(self, asset_type, source_filter: str = None) -> FluentSearch:
+        """
+        Build the base search for active assets of a type, optionally restricted to a source
+        
+        Args:
+            asset_type: Type of asset to query
+            source_filter: Optional filter for source system
+            
+        Returns:
+            FluentSearch builder for the requested assets
+        """
+        search_builder = (
+            FluentSearch()
+            .where(FluentSearch.asset_type(asset_type))
+            .where(FluentSearch.active_assets())
+        )
+        
+        # Add source filter if provided
+        if source_filter:
+            if asset_type == Table:
+                search_builder = search_builder.where(Table.CONNECTION_NAME.contains(source_filter))
+        
+        return search_builder
+    
+    async def _count_assets(self, asset_type, source_filter: str = None) -> int:
+        """
+        Count all active assets of a type without fetching them
+        
+        Args:
+            asset_type: Type of asset to count
+            source_filter: Optional filter for source system
+            
+        Returns:
+            Number of matching assets
+        """
+        try:
+            return self._build_asset_search(asset_type, source_filter).count(self.atlan_client)
+        except Exception as e:
+            logger.error(f"Failed to count assets: {str(e)}")
+            return 0
+    
     async def _get_assets_with_pii_classification(self, asset_type, source_filter: str = None) -> List[Dict[str, Any]]:
         """
         Get assets with PII classification from Atlan
@@ -153,61 +342,69 @@ class PIIInventoryManager:
         assets = []
         
         try:
-            # Build the search request
-            search_builder = (
-                FluentSearch()
-                .where(FluentSearch.asset_type(asset_type))
-                .where(FluentSearch.active_assets())
+            # Build the search request, letting Atlan return only PII-classified assets
+            search_builder = self._build_asset_search(asset_type, source_filter).where(
+                CustomMetadataField(
+                    client=self.atlan_client,
+                    set_name="PIIClassification",
+                    attribute_name="hasPII"
+                ).eq("Yes")
             )
             
-            # Add source filter if provided
-            if source_filter:
-                if asset_type == Table:
-                    search_builder = search_builder.where(Table.CONNECTION_NAME.contains(source_filter))
+            # Only request the attributes read below (guid and type name are always returned)
+            for field in (Asset.NAME, Asset.QUALIFIED_NAME, Asset.ATLAN_TAGS):
+                search_builder = search_builder.include_on_results(field)
+            for set_name in _CUSTOM_METADATA_SETS:
+                cm_attributes = self.atlan_client.custom_metadata_cache.get_attributes_for_search_results(set_name)
+                for attribute in cm_attributes or []:
+                    search_builder = search_builder.include_on_results(attribute)
             
-            request = search_builder.to_request()
+            request = search_builder.page_size(_SEARCH_PAGE_SIZE).to_request()
             
-            # Execute the search
-            for asset in self.atlan_client.asset.search(request):
+            # Execute the search, prefetching the next page while this one is processed
+            results = self.atlan_client.asset.search(request)
+            for asset in _prefetch(results, maxsize=_SEARCH_PAGE_SIZE * _PREFETCH_PAGES):
                 # Check if the asset has PII classification
                 has_pii = False
                 pii_types = []
                 sensitivity_level = "Low"
                 cia_rating = {}
                 sensitive_columns = []
-                compliance_tags = []
                 
                 # Extract PII classification from custom metadata
+                # Properties defined on the set but not populated on the asset read as None
+                pii_metadata = None
                 try:
-                    pii_metadata = asset.get_custom_metadata("PIIClassification")
-                    if pii_metadata:
-                        has_pii = pii_metadata.get("hasPII") == "Yes"
-                        pii_types = [t.strip() for t in pii_metadata.get("piiTypes", "").split(",") if t.strip()]
-                        sensitivity_level = pii_metadata.get("sensitivityLevel", "Low")
-                        
-                        if "sensitiveColumns" in pii_metadata:
-                            sensitive_columns = [c.strip() for c in pii_metadata.get("sensitiveColumns", "").split(",") if c.strip()]
-                except:
-                    pass
+                    pii_metadata = asset.get_custom_metadata(self.atlan_client, "PIIClassification")
+                except (AttributeError, KeyError, NotFoundError) as e:
+                    logger.debug(f"No PIIClassification metadata on {asset.qualified_name}: {str(e)}")
+                if pii_metadata:
+                    has_pii = pii_metadata.get("hasPII") == "Yes"
+                    pii_types = [t.strip() for t in (pii_metadata.get("piiTypes") or "").split(",") if t.strip()]
+                    sensitivity_level = pii_metadata.get("sensitivityLevel") or "Low"
+                    
+                    if "sensitiveColumns" in pii_metadata:
+                        sensitive_columns = [c.strip() for c in (pii_metadata.get("sensitiveColumns") or "").split(",") if c.strip()]
+                
+                # Safety net in case the server-side filter is not honoured
+                if not has_pii:
+                    continue
                 
                 # Extract CIA ratings from custom metadata
+                cia_metadata = None
                 try:
-                    cia_metadata = asset.get_custom_metadata("CIARating")
-                    if cia_metadata:
-                        cia_rating = {
-                            "confidentiality": cia_metadata.get("confidentiality", "Low"),
-                            "integrity": cia_metadata.get("integrity", "Low"),
-                            "availability": cia_metadata.get("availability", "Low")
-                        }
-                except:
-                    pass
+                    cia_metadata = asset.get_custom_metadata(self.atlan_client, "CIARating")
+                except (AttributeError, KeyError, NotFoundError) as e:
+                    logger.debug(f"No CIARating metadata on {asset.qualified_name}: {str(e)}")
+                if cia_metadata:
+                    cia_rating = {
+                        "confidentiality": cia_metadata.get("confidentiality") or "Low",
+                        "integrity": cia_metadata.get("integrity") or "Low",
+                        "availability": cia_metadata.get("availability") or "Low"
+                    }
                 
                 # Extract compliance tags
-                try:
-                    if hasattr(asset, "atlan_tags") and asset.atlan_tags:
-                        compliance_tags = [tag for tag in asset.atlan_tags]
-                except:
-                    pass
+                compliance_tags = list(getattr(asset, "atlan_tags", None) or ())
                 
                 # Add asset to the list
                 assets.append({
@@ -229,24 +426,29 @@ class PIIInventoryManager:
             logger.error(f"Failed to get assets with PII classification: {str(e)}")
             return []
     
-    def _determine_source(self, qualified_name: str) -> str:
-        """Determine the source system from qualified name"""
-        if "postgres" in qualified_name.lower():
-            return "postgres"
-        elif "snowflake" in qualified_name.lower():
-            return "snowflake"
-        elif "s3" in qualified_name.lower():
-            return "s3"
-        else:
-            return "unknown"
+    @staticmethod
+    def _determine_source(qualified_name: str) -> str:
+        """Determine the source system from the connection prefix of a qualified name"""
+        # Qualified names look like "default/<connector>/<epoch>/...", so only the
+        # leading "default/<connector>" segments need to be inspected
+        return _source_for_prefix("/".join(qualified_name.split("/", 2)[:2]))
     
     def _save_report_as_json(self, report: Dict[str, Any]) -> str:
-        """Save the report as a JSON file"""
+        """Save the report as a JSON file, streaming sensitive assets one at a time"""
         filename = f"pii_inventory_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            with open(filename, 'wb') as f:
+                f.write(b"{\n")
+                for key, value in report.items():
+                    if key != "sensitive_assets":
+                        f.write(b'  "%s": %s,\n' % (key.encode(), _dumps(value)))
+                
+                f.write(b'  "sensitive_assets": [')
+                for index, asset in enumerate(report.get("sensitive_assets", [])):
+                    f.write(b"\n    " if index == 0 else b",\n    ")
+                    f.write(_dumps(asset))
+                f.write(b"\n  ]\n}\n")
             
             logger.info(f"PII inventory report saved as {filename}")
             return filename
@@ -262,40 +464,35 @@ class PIIInventoryManager:
             os.makedirs(report_dir, exist_ok=True)
             
             # Save summary as CSV
-            summary_df = pd.DataFrame([{
-                "total_assets_scanned": report["summary"]["total_assets_scanned"],
-                "assets_with_pii": report["summary"]["assets_with_pii"],
-                "high_sensitivity_assets": report["summary"]["high_sensitivity_assets"],
-                "medium_sensitivity_assets": report["summary"]["medium_sensitivity_assets"],
-                "low_sensitivity_assets": report["summary"]["low_sensitivity_assets"],
-                "generated_at": report["generated_at"]
-            }])
-            summary_df.to_csv(f"{report_dir}/summary.csv", index=False)
+            summary_row = dict(report["summary"])
+            summary_row["generated_at"] = report["generated_at"]
+            with open(f"{report_dir}/summary.csv", "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(summary_row))
+                writer.writeheader()
+                writer.writerow(summary_row)
             
             # Save by source as CSV
-            source_data = []
-            for source, counts in report["by_source"].items():
-                source_data.append({
-                    "source": source,
-                    "total": counts["total"],
-                    "with_pii": counts["with_pii"]
-                })
-            source_df = pd.DataFrame(source_data)
-            source_df.to_csv(f"{report_dir}/by_source.csv", index=False)
+            with open(f"{report_dir}/by_source.csv", "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["source", "total", "with_pii"])
+                for source, counts in report["by_source"].items():
+                    writer.writerow([source, counts["total"], counts["with_pii"]])
             
             # Save by PII type as CSV
-            pii_type_data = []
-            for pii_type, count in report["by_pii_type"].items():
-                pii_type_data.append({
-                    "pii_type": pii_type,
-                    "count": count
-                })
-            pii_type_df = pd.DataFrame(pii_type_data)
-            pii_type_df.to_csv(f"{report_dir}/by_pii_type.csv", index=False)
+            with open(f"{report_dir}/by_pii_type.csv", "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["pii_type", "count"])
+                writer.writerows(report["by_pii_type"].items())
             
-            # Save sensitive assets as CSV
-            sensitive_assets_df = pd.DataFrame(report["sensitive_assets"])
-            sensitive_assets_df.to_csv(f"{report_dir}/sensitive_assets.csv", index=False)
+            # Stream sensitive assets to CSV row by row; nested fields are stored as JSON
+            with open(f"{report_dir}/sensitive_assets.csv", "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=SENSITIVE_ASSET_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                for asset in report["sensitive_assets"]:
+                    row = dict(asset)
+                    for field in _NESTED_SENSITIVE_ASSET_FIELDS:
+                        row[field] = json.dumps(row.get(field))
+                    writer.writerow(row)
             
             logger.info(f"PII inventory report saved in directory {report_dir}")
             return report_dir
@@ -310,11 +507,8 @@ class PIIInventoryManager:
         Returns:
             Dictionary containing dashboard data
         """
-        # This is a placeholder for generating dashboard data
-        # In a real implementation, you would query Atlan for PII data
-        # and format it for visualization
-        
-        report = await self.generate_inventory_report()
+        # Dashboard refreshes reuse a recent report instead of re-querying Atlan
+        report = await self._get_report(save=False)
         
         # Format data for dashboard
         dashboard_data = {
@@ -5,12 +5,24 @@ Handles S3 object discovery, metadata extraction, and asset creation
 """
 
 import boto3
-import pandas as pd
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import logging
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
-from io import StringIO
+import csv
+import functools
+import json
+import mimetypes
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 from atlan_client import get_atlan_client
 from pyatlan.model.assets import S3Object, S3Bucket, Connection
@@ -23,6 +35,91 @@ from config import S3Config
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of S3 objects whose metadata is extracted concurrently
+MAX_CONCURRENT_OBJECTS = 32
+
+# Worker threads available for blocking boto3 / Atlan SDK calls
+IO_POOL_WORKERS = 32
+
+# Shared S3 client settings; the pool is sized above IO_POOL_WORKERS so that
+# concurrent calls never queue for a connection
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'standard', 'max_attempts': 5}
+)
+
+# How many rows are used for schema inference, and how much of each CSV may be
+# streamed (in chunks of SCHEMA_STREAM_CHUNK_BYTES) to collect them
+SCHEMA_SAMPLE_ROWS = 5
+SCHEMA_SAMPLE_MAX_BYTES = 1 << 20
+SCHEMA_STREAM_CHUNK_BYTES = 1 << 16
+
+# S3 Select error codes meaning the API is not offered to this account or bucket
+# (AWS closed S3 Select to new customers in 2024)
+SELECT_UNSUPPORTED_ERROR_CODES = frozenset({'MethodNotAllowed', 'NotImplemented', 'UnsupportedOperation'})
+
+# Columns beyond this are ignored when inferring the schema of very wide CSVs
+MAX_INFER_COLUMNS = 512
+
+# Inferred schemas keyed by object ETag, persisted between runs
+SCHEMA_CACHE_FILE = "schema_cache.json"
+
+@functools.lru_cache(maxsize=16)
+def _get_s3_client(region: str):
+    """Return a shared S3 client for the region, so connectors reuse its connection pool"""
+    return boto3.client('s3', region_name=region, config=S3_CLIENT_CONFIG)
+
+def _infer_csv_schema_from_bytes(raw_bytes: bytes, inferred_at: str) -> Dict[str, Any]:
+    """
+    Infer column names, types and sample values from the first rows of a CSV
+    
+    Args:
+        raw_bytes: Header and leading rows of the CSV
+        inferred_at: ISO timestamp recorded as the inference time
+        
+    Returns:
+        Schema information dictionary
+    """
+    # Empty cells are read as nulls (as pandas did) so they never become sample values.
+    # Very wide files only have their first MAX_INFER_COLUMNS columns converted.
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    header = raw_bytes.split(b'\n', 1)[0]
+    if header.count(b',') >= MAX_INFER_COLUMNS:
+        column_names = next(csv.reader([header.decode('utf-8', errors='replace')]))
+        convert_options.include_columns = column_names[:MAX_INFER_COLUMNS]
+    
+    # Use pyarrow's streaming CSV reader; only the first block is parsed
+    reader = pacsv.open_csv(
+        pa.BufferReader(raw_bytes),
+        read_options=pacsv.ReadOptions(block_size=1 << 16),
+        convert_options=convert_options
+    )
+    batch = reader.read_next_batch().slice(0, SCHEMA_SAMPLE_ROWS)
+    
+    # Nulls are dropped and samples sliced inside Arrow; only the (at most
+    # three) sample values per column are converted to Python objects
+    columns = [
+        {
+            'name': col_name,
+            'type': str(col_type),
+            'sample_values': column.drop_null().slice(0, 3).to_pylist()
+        }
+        for col_name, col_type, column in zip(batch.schema.names, batch.schema.types, batch.columns)
+    ]
+    
+    schema_info = {
+        'columns': columns,
+        'row_count_sample': batch.num_rows,
+        'column_count': len(columns),
+        'inferred_at': inferred_at
+    }
+    
+    return schema_info
+
+def _to_epoch_ns(timestamp: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds (naive values are treated as local time)"""
+    return int(timestamp.timestamp() * 1_000_000_000)
+
 class S3Connector:
     """Main S3 connector class for Atlan integration"""
     
@@ -31,34 +128,71 @@ class S3Connector:
         self.connection_qn: Optional[str] = None
         
         # Initialize clients
-        self.s3_client = boto3.client('s3', region_name=s3_config.region)
+        self.s3_client = _get_s3_client(s3_config.region)
         self.atlan_client = get_atlan_client()
         
         # Create unique connection qualifier
         self.connection_qualifier = f"s3-{self.s3_config.unique_suffix.lower()}"
         
-    async def discover_s3_objects(self) -> List[Dict[str, Any]]:
+        # Invariant prefixes of every object's ARN and qualified name
+        self._arn_prefix = f"arn:aws:s3:::{s3_config.bucket_name}-{s3_config.unique_suffix}/"
+        self._qn_prefix = f"default/s3/{self.connection_qualifier}/{s3_config.bucket_name}/"
+        
+        # Bounds concurrent metadata extraction; recreated for each discovery run
+        self._metadata_semaphore = asyncio.Semaphore(MAX_CONCURRENT_OBJECTS)
+        
+        # Schemas inferred in one discovery run share a single timestamp
+        self._batch_inferred_at = datetime.now(timezone.utc).isoformat()
+        
+        # Whether S3 Select works here (None until the first attempt tells us). The
+        # lock lets a single object probe it; recreated for each discovery run.
+        self._select_supported: Optional[bool] = None
+        self._select_probe_lock = asyncio.Lock()
+        
+        # Blocking boto3 and Atlan SDK calls run here so they do not stall the event loop
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS)
+        
+        # Schemas of unchanged objects are reused instead of being re-inferred
+        self._schema_cache: Dict[str, Dict] = self._load_schema_cache()
+        
+    async def _run_io(self, func, *args, **kwargs):
+        """Run a blocking boto3 or Atlan SDK call on the connector's I/O thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(func, *args, **kwargs))
+    
+    async def _search(self, request) -> list:
+        """Run an Atlan search off the event loop and return all results"""
+        return await self._run_io(lambda: list(self.atlan_client.asset.search(request)))
+    
+    async def discover_s3_objects(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Discover all objects in the S3 bucket
         
+        Args:
+            since: Only extract metadata for objects modified after this timestamp
+        
         Returns:
             List of S3 object metadata dictionaries
         """
         logger.info(f"Discovering objects in bucket: {self.s3_config.bucket_name}")
         
         try:
-            # List all objects in the bucket
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_config.bucket_name
-            )
-            
-            objects = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Only process CSV files for this use case
-                    if obj['Key'].endswith('.csv'):
-                        object_metadata = await self._extract_object_metadata(obj)
-                        objects.append(object_metadata)
+            self._metadata_semaphore = asyncio.Semaphore(MAX_CONCURRENT_OBJECTS)
+            self._select_probe_lock = asyncio.Lock()
+            self._batch_inferred_at = datetime.now(timezone.utc).isoformat()
+            since_ns = _to_epoch_ns(since) if since is not None else None
+            
+            # List the bucket root one level deep, then list every top-level prefix
+            # concurrently; metadata extraction starts as soon as each page arrives
+            tasks, prefixes = await self._list_csv_objects('', since_ns, delimiter='/')
+            for prefix_tasks, _ in await asyncio.gather(
+                *(self._list_csv_objects(prefix, since_ns) for prefix in prefixes)
+            ):
+                tasks.extend(prefix_tasks)
+            
+            objects = list(await asyncio.gather(*tasks))
+            # A filtered run only sees part of the bucket, so keep the other cached schemas
+            self._save_schema_cache(objects, replace=since is None)
             
             logger.info(f"Discovered {len(objects)} CSV objects")
             return objects
@@ -67,6 +201,49 @@ class S3Connector:
             logger.error(f"Error discovering S3 objects: {str(e)}")
             raise
     
+    async def _list_csv_objects(
+        self,
+        prefix: str,
+        since_ns: Optional[int],
+        delimiter: Optional[str] = None
+    ) -> Tuple[List[asyncio.Task], List[str]]:
+        """
+        Page through one prefix of the bucket, scheduling metadata extraction for each CSV
+        
+        Args:
+            prefix: Key prefix to list
+            since_ns: Skip objects last modified at or before this epoch-nanosecond time
+            delimiter: Optional delimiter; keys below it are returned as common prefixes
+            
+        Returns:
+            Tuple of (metadata extraction tasks, common prefixes)
+        """
+        params = {'Bucket': self.s3_config.bucket_name, 'Prefix': prefix}
+        if delimiter:
+            params['Delimiter'] = delimiter
+        pages = iter(self.s3_client.get_paginator('list_objects_v2').paginate(**params))
+        
+        tasks = []
+        common_prefixes = []
+        while True:
+            page = await self._run_io(next, pages, None)
+            if page is None:
+                break
+            
+            common_prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            
+            # Only process CSV files for this use case
+            contents = [obj for obj in page.get('Contents', []) if obj['Key'].endswith('.csv')]
+            
+            # Skip schema inference for objects that have not changed since `since`
+            if since_ns is not None:
+                contents = [obj for obj in contents if _to_epoch_ns(obj['LastModified']) > since_ns]
+            
+            for obj in contents:
+                tasks.append(asyncio.create_task(self._extract_object_metadata(obj)))
+        
+        return tasks, common_prefixes
+    
     async def _extract_object_metadata(self, s3_object: Dict) -> Dict[str, Any]:
         """
         Extract comprehensive metadata from S3 object
@@ -78,18 +255,21 @@ class S3Connector:
             Enhanced metadata dictionary
         """
         object_key = s3_object['Key']
+        etag = s3_object['ETag'].strip('"')
         
-        # Get object head for additional metadata
-        head_response = self.s3_client.head_object(
-            Bucket=self.s3_config.bucket_name,
-            Key=object_key
-        )
+        # Size, ETag, LastModified and StorageClass already come from the listing.
+        # Content type is inferred from the key instead of paying for a HEAD request
+        # (billed like a GET) per object.
+        content_type = mimetypes.guess_type(object_key)[0] or 'text/csv'
         
-        # Sample the CSV for schema inference
-        schema_info = await self._infer_csv_schema(object_key)
+        # Sample the CSV for schema inference unless this content was already seen
+        schema_info = self._schema_cache.get(etag)
+        if schema_info is None:
+            async with self._metadata_semaphore:
+                schema_info = await self._infer_csv_schema(object_key)
         
         # Generate unique ARN for Atlan
-        unique_arn = f"arn:aws:s3:::{self.s3_config.bucket_name}-{self.s3_config.unique_suffix}/{object_key}"
+        unique_arn = self._arn_prefix + object_key
         
         # Convention-based mapping: "TABLE_NAME.csv" -> "TABLE_NAME"
         table_name = object_key[:-4].upper() if object_key.endswith('.csv') else object_key.upper()
@@ -104,58 +284,149 @@ class S3Connector:
             'bucket': self.s3_config.bucket_name,
             'size': s3_object['Size'],
             'last_modified': s3_object['LastModified'],
-            'etag': s3_object['ETag'].strip('"'),
+            'etag': etag,
             'storage_class': s3_object.get('StorageClass', 'STANDARD'),
-            'content_type': head_response.get('ContentType', 'text/csv'),
+            'content_type': content_type,
             'unique_arn': unique_arn,
             'schema_info': schema_info,
             'file_mapping': file_mapping,
-            'qualified_name': f"default/s3/{self.connection_qualifier}/{self.s3_config.bucket_name}/{object_key}"
+            'qualified_name': self._qn_prefix + object_key
         }
         
         return metadata
     
-    async def _infer_csv_schema(self, object_key: str) -> Dict[str, Any]:
+    def _load_schema_cache(self) -> Dict[str, Dict]:
+        """Load previously inferred schemas keyed by ETag"""
+        try:
+            with open(SCHEMA_CACHE_FILE, 'rb') as f:
+                content = f.read()
+            return orjson.loads(content) if orjson is not None else json.loads(content)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not load schema cache: {str(e)}")
+            return {}
+    
+    def _save_schema_cache(self, objects: List[Dict[str, Any]], replace: bool = True) -> None:
+        """Persist successfully inferred schemas for the objects of this run"""
+        schemas = {
+            obj['etag']: obj['schema_info']
+            for obj in objects
+            if obj.get('etag') and obj.get('schema_info') and 'error' not in obj['schema_info']
+        }
+        if replace:
+            self._schema_cache = schemas
+        else:
+            self._schema_cache.update(schemas)
+        try:
+            if orjson is not None:
+                content = orjson.dumps(self._schema_cache, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+            else:
+                content = json.dumps(self._schema_cache, default=str).encode()
+            with open(SCHEMA_CACHE_FILE, 'wb') as f:
+                f.write(content)
+        except Exception as e:
+            logger.warning(f"Could not save schema cache: {str(e)}")
+    
+    async def _sample_csv_bytes(self, object_key: str) -> bytes:
         """
-        Infer schema from CSV file by reading first few rows
+        Fetch the header and first rows of a CSV object for schema inference
+        
+        S3 Select is used so that S3 returns exactly the header plus
+        SCHEMA_SAMPLE_ROWS complete records. Buckets or accounts without S3 Select
+        fall back to streaming the object until the header and SCHEMA_SAMPLE_ROWS
+        records have arrived, or SCHEMA_SAMPLE_MAX_BYTES have been read. Once Select
+        is reported as unsupported it is not attempted again by this connector, and
+        until its support is known only one object at a time tries it.
         
         Args:
             object_key: S3 object key
             
         Returns:
-            Schema information dictionary
+            Raw CSV bytes
         """
-        try:
-            # Read first 1000 bytes to infer schema
-            response = self.s3_client.get_object(
+        def _select() -> bytes:
+            response = self.s3_client.select_object_content(
                 Bucket=self.s3_config.bucket_name,
                 Key=object_key,
-                Range='bytes=0-999'
+                ExpressionType='SQL',
+                # The header is returned as a record when FileHeaderInfo is NONE
+                Expression=f'SELECT * FROM s3object LIMIT {SCHEMA_SAMPLE_ROWS + 1}',
+                InputSerialization={'CSV': {'FileHeaderInfo': 'NONE', 'AllowQuotedRecordDelimiter': True}},
+                OutputSerialization={'CSV': {}}
+            )
+            return b''.join(
+                event['Records']['Payload']
+                for event in response['Payload']
+                if 'Records' in event
+            )
+        
+        async def _try_select() -> Optional[bytes]:
+            try:
+                raw_bytes = await self._run_io(_select)
+                self._select_supported = True
+                return raw_bytes
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') in SELECT_UNSUPPORTED_ERROR_CODES:
+                    self._select_supported = False
+                    logger.info(f"S3 Select is not supported here, sampling objects with GET: {str(e)}")
+                else:
+                    logger.debug(f"S3 Select failed for {object_key}, streaming the object: {str(e)}")
+                return None
+        
+        raw_bytes = None
+        if self._select_supported:
+            raw_bytes = await _try_select()
+        elif self._select_supported is None:
+            # Until one object has shown whether Select is supported, try it one at a time
+            async with self._select_probe_lock:
+                if self._select_supported is not False:
+                    raw_bytes = await _try_select()
+        if raw_bytes is not None:
+            return raw_bytes
+        
+        def _stream() -> bytes:
+            response = self.s3_client.get_object(
+                Bucket=self.s3_config.bucket_name,
+                Key=object_key
             )
+            body = response['Body']
+            buf = bytearray()
+            newlines = 0
+            truncated = False
+            try:
+                for chunk in body.iter_chunks(SCHEMA_STREAM_CHUNK_BYTES):
+                    buf.extend(chunk)
+                    newlines += chunk.count(b'\n')
+                    if newlines > SCHEMA_SAMPLE_ROWS or len(buf) >= SCHEMA_SAMPLE_MAX_BYTES:
+                        truncated = True
+                        break
+            finally:
+                # Closing early aborts the transfer of the rest of the object
+                body.close()
+            
+            # Drop a trailing partial row cut off by stopping early
+            if truncated and b'\n' in buf:
+                del buf[buf.rfind(b'\n') + 1:]
+            return bytes(buf)
+        
+        return await self._run_io(_stream)
+    
+    async def _infer_csv_schema(self, object_key: str) -> Dict[str, Any]:
+        """
+        Infer schema from CSV file by reading first few rows
+        
+        Args:
+            object_key: S3 object key
             
-            content = response['Body'].read().decode('utf-8')
-            
-            # Use pandas to infer schema
-            df = pd.read_csv(StringIO(content), nrows=5)
-            
-            columns = []
-            for col_name in df.columns:
-                col_type = str(df[col_name].dtype)
-                col_info = {
-                    'name': col_name,
-                    'type': col_type,
-                    'sample_values': df[col_name].dropna().head(3).tolist()
-                }
-                columns.append(col_info)
-            
-            schema_info = {
-                'columns': columns,
-                'row_count_sample': len(df),
-                'column_count': len(columns),
-                'inferred_at': datetime.now().isoformat()
-            }
+        Returns:
+            Schema information dictionary
+        """
+        try:
+            raw_bytes = await self._sample_csv_bytes(object_key)
             
-            return schema_info
+            # Parsing runs on the I/O pool; pyarrow releases the GIL while it parses
+            return await self._run_io(_infer_csv_schema_from_bytes, raw_bytes, self._batch_inferred_at)
             
         except Exception as e:
             logger.warning(f"Could not infer schema for {object_key}: {str(e)}")
@@ -191,7 +462,7 @@ class S3Connector:
                 .where(FluentSearch.asset_type(S3Object))
                 .where(S3Object.S3BUCKET_QUALIFIED_NAME.eq(bucket_asset.qualified_name))
             ).to_request()
-            for asset in self.atlan_client.asset.search(request):
+            for asset in await self._search(request):
                 existing_assets_map[asset.name] = asset
             logger.info(f"Found {len(existing_assets_map)} existing S3 objects in the bucket.")
         except NotFoundError:
@@ -214,14 +485,16 @@ class S3Connector:
                 })
             else:
                 # Asset is new, add it to the batch for creation
-                self._create_s3_object_asset(bucket_asset.qualified_name, s3_obj_meta, asset_batch)
+                asset_batch.append(self._build_s3_object_asset(bucket_asset.qualified_name, s3_obj_meta))
 
         # 4. Save the batch of new assets, if any
         if asset_batch:
             logger.info(f"Creating {len(asset_batch)} new S3 object assets...")
-            response = self.atlan_client.asset.save(asset_batch)
-            if response and response.assets_created(asset_type=S3Object):
-                created_assets_map = {asset.name: asset for asset in response.assets_created(asset_type=S3Object)}
+            response = await self._run_io(self.atlan_client.asset.save, asset_batch)
+            # assets_created filters the whole mutation list on each call, so call it once
+            created_assets = response.assets_created(asset_type=S3Object) if response else []
+            if created_assets:
+                created_assets_map = {asset.name: asset for asset in created_assets}
                 # Correlate created assets back to the original s3_objects
                 for s3_obj in s3_objects:
                     if s3_obj['key'] in created_assets_map:
@@ -252,21 +525,21 @@ class S3Connector:
             .where(Connection.STATUS.eq("ACTIVE"))
         ).to_request()
 
-        search_results = list(self.atlan_client.asset.search(request))
+        search_results = await self._search(request)
         
         if search_results:
             logger.info(f"Found existing connection: {search_results[0].qualified_name}")
             return search_results[0].qualified_name
         else:
             logger.info(f"Connection '{connection_name}' not found, creating a new one.")
-            admin_role_guid = self.atlan_client.role_cache.get_id_for_name("$admin")
+            admin_role_guid = await self._run_io(self.atlan_client.role_cache.get_id_for_name, "$admin")
             connection = Connection.creator(
                 client=self.atlan_client,
                 name=connection_name,
                 connector_type=AtlanConnectorType.S3,
                 admin_roles=[admin_role_guid]
             )
-            response = self.atlan_client.asset.save(connection)
+            response = await self._run_io(self.atlan_client.asset.save, connection)
             created_connection = response.assets_created(asset_type=Connection)[0]
             logger.info(f"Successfully created new connection: {created_connection.qualified_name}")
             return created_connection.qualified_name
@@ -287,7 +560,7 @@ class S3Connector:
                 .where(S3Bucket.STATUS.eq("ACTIVE"))
             ).to_request()
 
-            search_results = list(self.atlan_client.asset.search(request))
+            search_results = await self._search(request)
             
             if search_results:
                 logger.info(f"Found existing S3 bucket asset: {search_results[0].qualified_name}")
@@ -303,16 +576,19 @@ class S3Connector:
             connection_qualified_name=self.connection_qn,
             aws_arn=f"arn:aws:s3:::{unique_bucket_name}"
         )
-        response = self.atlan_client.asset.save(s3bucket)
+        response = await self._run_io(self.atlan_client.asset.save, s3bucket)
         
         # Important: Verify creation and retrieve the full asset
-        if response and response.assets_created(asset_type=S3Bucket):
-            created_bucket = response.assets_created(asset_type=S3Bucket)[0]
+        created_buckets = response.assets_created(asset_type=S3Bucket) if response else []
+        if created_buckets:
+            created_bucket = created_buckets[0]
             logger.info(f"Successfully created S3 Bucket asset with GUID: {created_bucket.guid}")
             
             # Re-fetch the asset to ensure it's fully available
             try:
-                retrieved_asset = self.atlan_client.asset.get_by_guid(created_bucket.guid, asset_type=S3Bucket)
+                retrieved_asset = await self._run_io(
+                    self.atlan_client.asset.get_by_guid, created_bucket.guid, asset_type=S3Bucket
+                )
                 logger.info(f"Successfully retrieved created bucket: {retrieved_asset.qualified_name}")
                 return retrieved_asset
             except NotFoundError as e:
@@ -322,9 +598,9 @@ class S3Connector:
             logger.error("S3 bucket asset creation did not return the expected response.")
             raise RuntimeError("Failed to create S3 bucket asset in Atlan.")
 
-    def _create_s3_object_asset(self, bucket_qualified_name: str, s3_obj: Dict[str, Any], asset_batch: list):
+    def _build_s3_object_asset(self, bucket_qualified_name: str, s3_obj: Dict[str, Any]) -> S3Object:
         """
-        Creates and adds an S3 object asset to a batch with enhanced column metadata.
+        Builds an unsaved S3 object asset with enhanced column metadata.
         """
         creator = S3Object.creator(
             name=s3_obj['key'],
@@ -365,7 +641,7 @@ class S3Connector:
         creator.s3_object_content_type = s3_obj['content_type']
         creator.s3_e_tag = s3_obj['etag']
         
-        asset_batch.append(creator)
+        return creator
     
     async def get_modified_objects_since(self, timestamp: datetime) -> List[Dict[str, Any]]:
         """
@@ -377,12 +653,8 @@ class S3Connector:
         Returns:
             List of modified objects
         """
-        all_objects = await self.discover_s3_objects()
-        
-        modified_objects = [
-            obj for obj in all_objects
-            if obj['last_modified'] > timestamp
-        ]
+        # Unmodified objects are filtered out before any metadata extraction
+        modified_objects = await self.discover_s3_objects(since=timestamp)
         
         logger.info(f"Found {len(modified_objects)} objects modified since {timestamp}")
         return modified_objects
@@ -478,7 +750,7 @@ class S3Connector:
                 .where(FluentSearch.active_assets())
             ).to_request()
             
-            search_results = list(self.atlan_client.asset.search(request))
+            search_results = await self._search(request)
             
             if not search_results:
                 logger.info(f"No existing asset found for {object_key}")
@@ -579,6 +851,10 @@ class S3Connector:
         """
         logger.info("Updating assets with AI insights and PII classifications")
         
+        # Updaters are collected and saved to Atlan in a single request
+        updaters_to_save = []
+        updated_keys = []
+        
         for asset_info in assets:
             try:
                 asset_key = asset_info['metadata']['key']
@@ -629,27 +905,28 @@ class S3Connector:
                         
                         # Store PII information in user_description instead of custom metadata
                         # since custom_metadata_set might not be available in this version of the SDK
-                        pii_description = f"\n\nPII Classification:\n"
-                        pii_description += f"- Has PII: {'Yes' if pii_data.get('has_pii', False) else 'No'}\n"
-                        pii_description += f"- PII Types: {', '.join(pii_data.get('pii_types', [])) if pii_data.get('pii_types') else 'None'}\n"
-                        pii_description += f"- Sensitivity Level: {pii_data.get('sensitivity_level', 'Low')}\n"
+                        pii_types = ', '.join(pii_data.get('pii_types', [])) if pii_data.get('pii_types') else 'None'
+                        parts = [
+                            updater.user_description or '',
+                            "\n\nPII Classification:\n",
+                            f"- Has PII: {'Yes' if pii_data.get('has_pii', False) else 'No'}\n",
+                            f"- PII Types: {pii_types}\n",
+                            f"- Sensitivity Level: {pii_data.get('sensitivity_level', 'Low')}\n",
+                        ]
                         
                         if pii_data.get('sensitive_columns'):
-                            pii_description += f"- Sensitive Columns: {', '.join(pii_data.get('sensitive_columns', []))}\n"
+                            parts.append(f"- Sensitive Columns: {', '.join(pii_data.get('sensitive_columns', []))}\n")
                         
                         # Apply CIA ratings if available
                         if pii_data.get('cia_rating'):
                             cia_rating = pii_data['cia_rating']
-                            pii_description += f"\nCIA Rating:\n"
-                            pii_description += f"- Confidentiality: {cia_rating.get('confidentiality', 'Low')}\n"
-                            pii_description += f"- Integrity: {cia_rating.get('integrity', 'Low')}\n"
-                            pii_description += f"- Availability: {cia_rating.get('availability', 'Low')}\n"
+                            parts.append("\nCIA Rating:\n")
+                            parts.append(f"- Confidentiality: {cia_rating.get('confidentiality', 'Low')}\n")
+                            parts.append(f"- Integrity: {cia_rating.get('integrity', 'Low')}\n")
+                            parts.append(f"- Availability: {cia_rating.get('availability', 'Low')}\n")
                         
                         # Append to existing description or set as new description
-                        if updater.user_description:
-                            updater.user_description += pii_description
-                        else:
-                            updater.user_description = pii_description
+                        updater.user_description = ''.join(parts)
                             
                         updates_made.append("PII classification")
                         logger.info(f"Setting PII classification for {asset_key}: {pii_data.get('pii_types', [])}")
@@ -663,20 +940,28 @@ class S3Connector:
                 if asset_key in compliance_tags and compliance_tags[asset_key]:
                     try:
                         logger.info(f"Applying compliance tags to {asset_key}: {compliance_tags[asset_key]}")
-                        self.add_tags_to_asset(asset, compliance_tags[asset_key])
+                        await self._run_io(self.add_tags_to_asset, asset, compliance_tags[asset_key])
                         updates_made.append("compliance tags")
                         logger.info(f"Successfully applied compliance tags to {asset_key}")
                     except Exception as tag_error:
                         logger.error(f"Failed to apply compliance tags to {asset_key}: {str(tag_error)}")
                 
-                # Update the asset
+                # Queue the asset update
                 if updates_made:
-                    self.atlan_client.asset.save(updater)
-                    logger.info(f"Successfully updated {asset_key} with: {', '.join(updates_made)}")
+                    updaters_to_save.append(updater)
+                    updated_keys.append(asset_key)
+                    logger.info(f"Queued update for {asset_key} with: {', '.join(updates_made)}")
                 else:
                     logger.info(f"No AI insights to update for {asset_key}")
                 
             except Exception as e:
                 logger.error(f"Failed to update asset {asset_info['metadata']['key']} with AI insights: {str(e)}")
         
+        if updaters_to_save:
+            try:
+                await self._run_io(self.atlan_client.asset.save, updaters_to_save)
+                logger.info(f"Successfully updated {len(updaters_to_save)} assets: {', '.join(updated_keys)}")
+            except Exception as e:
+                logger.error(f"Failed to save AI insights for {len(updaters_to_save)} assets: {str(e)}")
+        
         logger.info("Completed updating assets with AI insights and PII classifications")
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from pyatlan.model.assets import S3Object
+
+import pii_inventory
+from pii_inventory import PIIInventoryManager, _prefetch
+
+# Custom metadata sets as the Atlan cache would describe them
+CM_SET_NAMES = {"cm-pii": "PIIClassification", "cm-cia": "CIARating"}
+CM_ATTRIBUTE_NAMES = {
+    "cm-pii": {"pii-1": "hasPII", "pii-2": "piiTypes", "pii-3": "sensitivityLevel", "pii-4": "sensitiveColumns"},
+    "cm-cia": {"cia-1": "confidentiality", "cia-2": "integrity", "cia-3": "availability"},
+}
+
+class FakeCustomMetadataCache:
+    """Minimal stand-in for pyatlan's custom metadata cache."""
+    map_attr_id_to_name = CM_ATTRIBUTE_NAMES
+
+    def get_id_for_name(self, name):
+        return {v: k for k, v in CM_SET_NAMES.items()}[name]
+
+    def get_name_for_id(self, cm_id):
+        return CM_SET_NAMES[cm_id]
+
+    def get_attr_name_for_id(self, cm_id, attr_id):
+        return CM_ATTRIBUTE_NAMES[cm_id][attr_id]
+
+    def is_attr_archived(self, attr_id):
+        return False
+
+    def get_attributes_for_search_results(self, set_name):
+        return []
+
+def make_s3_asset(index, has_pii):
+    """Build an S3Object carrying PIIClassification and CIARating custom metadata."""
+    asset = S3Object()
+    asset.guid = f"guid-{index}"
+    asset.name = f"file{index}.csv"
+    asset.qualified_name = f"default/s3/123/bucket/file{index}.csv"
+    asset.business_attributes = {
+        "cm-pii": {"pii-1": "Yes" if has_pii else "No", "pii-2": "email, phone", "pii-3": "High"},
+        "cm-cia": {"cia-1": "High"},
+    }
+    return asset
+
+def wait_for_thread_count(expected, timeout=5.0):
+    """Wait until the number of live threads drops to the expected count."""
+    deadline = time.monotonic() + timeout
+    while threading.active_count() > expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return threading.active_count()
+
+def test_prefetch_yields_all_results():
+    """
+    Tests that prefetching yields every result in order.
+    """
+    assert list(_prefetch(iter(range(2500)), maxsize=10)) == list(range(2500))
+
+def test_prefetch_propagates_errors():
+    """
+    Tests that an error raised by the underlying search reaches the consumer.
+    """
+    def failing_results():
+        yield 1
+        raise RuntimeError("search failed")
+
+    with pytest.raises(RuntimeError, match="search failed"):
+        list(_prefetch(failing_results(), maxsize=2))
+
+def test_prefetch_stops_producer_when_consumer_stops(mocker):
+    """
+    Tests that the producer thread exits when the consumer stops early instead of blocking on a full buffer.
+    """
+    mocker.patch("pii_inventory._PREFETCH_PUT_TIMEOUT", 0.05)
+    baseline = threading.active_count()
+
+    with pytest.raises(ValueError):
+        for _ in _prefetch(iter(range(10000)), maxsize=10):
+            raise ValueError("consumer failed")
+
+    assert wait_for_thread_count(baseline) == baseline
+
+def test_get_assets_with_pii_classification_reads_custom_metadata(mocker):
+    """
+    Tests that PII and CIA custom metadata are read from search results and non-PII assets are skipped.
+    """
+    mocker.patch("pii_inventory.FluentSearch")
+    mocker.patch("pii_inventory.CustomMetadataField")
+    client = MagicMock()
+    client.custom_metadata_cache = FakeCustomMetadataCache()
+    client.asset.search.return_value = iter([make_s3_asset(0, True), make_s3_asset(1, False)])
+
+    assets = asyncio.run(PIIInventoryManager(client)._get_assets_with_pii_classification(S3Object))
+
+    assert [a["guid"] for a in assets] == ["guid-0"]
+    assert assets[0]["pii_types"] == ["email", "phone"]
+    assert assets[0]["sensitivity_level"] == "High"
+    assert assets[0]["cia_rating"] == {"confidentiality": "High", "integrity": "Low", "availability": "Low"}
+
+def test_determine_source_uses_connection_prefix():
+    """
+    Tests that the source system is taken from the connector segment of the qualified name.
+    """
+    determine_source = PIIInventoryManager._determine_source
+
+    assert determine_source("default/s3/123/bucket/postgres_export.csv") == "s3"
+    assert determine_source("default/postgres/456/db/schema/table") == "postgres"
+    assert determine_source("default/snowflake/789/db/schema/table") == "snowflake"
+    assert determine_source("unrelated") == "unknown"
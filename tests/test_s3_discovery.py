@@ -0,0 +1,173 @@
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+import s3_connector
+from s3_connector import S3Connector, _infer_csv_schema_from_bytes
+from config import S3Config
+
+BUCKET_NAME = "test-bucket"
+
+@pytest.fixture
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+@pytest.fixture
+def s3_client(aws_credentials):
+    """Yield a mock S3 client with an empty test bucket."""
+    with mock_aws():
+        # Connectors share cached clients; start each test with a fresh one
+        s3_connector._get_s3_client.cache_clear()
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET_NAME)
+        yield client
+        s3_connector._get_s3_client.cache_clear()
+
+@pytest.fixture
+def connector(s3_client, mocker, tmp_path):
+    """S3Connector with a mocked Atlan client and a schema cache under tmp_path."""
+    mocker.patch("s3_connector.get_atlan_client", return_value=MagicMock())
+    mocker.patch("s3_connector.SCHEMA_CACHE_FILE", str(tmp_path / "schema_cache.json"))
+    return S3Connector(S3Config(bucket_name=BUCKET_NAME))
+
+def select_not_supported(connector):
+    """Make S3 Select fail the way it does for accounts without access to it."""
+    connector.s3_client = MagicMock(wraps=connector.s3_client)
+    connector.s3_client.select_object_content = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "MethodNotAllowed"}}, "SelectObjectContent")
+    )
+    return connector.s3_client.select_object_content
+
+def test_infer_csv_schema_from_bytes():
+    """
+    Tests that column types, sample values and the sampled row count are inferred.
+    """
+    raw = b"id,name,joined\n" + b"".join(b"%d,user%d,2024-01-0%d\n" % (i, i, i + 1) for i in range(8))
+
+    schema_info = _infer_csv_schema_from_bytes(raw, "2024-01-01T00:00:00+00:00")
+
+    assert schema_info["column_count"] == 3
+    assert schema_info["row_count_sample"] == s3_connector.SCHEMA_SAMPLE_ROWS
+    assert schema_info["inferred_at"] == "2024-01-01T00:00:00+00:00"
+    columns = {c["name"]: c for c in schema_info["columns"]}
+    assert columns["id"]["type"] == "int64"
+    assert columns["id"]["sample_values"] == [0, 1, 2]
+    assert columns["name"]["sample_values"] == ["user0", "user1", "user2"]
+
+def test_infer_csv_schema_from_bytes_skips_empty_cells():
+    """
+    Tests that empty cells are treated as nulls and never become sample values.
+    """
+    schema_info = _infer_csv_schema_from_bytes(b"name,age\nAl,1\n,2\nBo,\n", "now")
+
+    columns = {c["name"]: c for c in schema_info["columns"]}
+    assert columns["name"]["sample_values"] == ["Al", "Bo"]
+    assert columns["age"]["sample_values"] == [1, 2]
+
+def test_infer_csv_schema_from_bytes_caps_wide_files():
+    """
+    Tests that only the first MAX_INFER_COLUMNS columns of very wide files are kept.
+    """
+    width = s3_connector.MAX_INFER_COLUMNS + 10
+    header = ",".join(f"c{i}" for i in range(width)).encode()
+    row = ",".join(str(i) for i in range(width)).encode()
+
+    schema_info = _infer_csv_schema_from_bytes(header + b"\n" + row + b"\n", "now")
+
+    assert schema_info["column_count"] == s3_connector.MAX_INFER_COLUMNS
+    assert schema_info["columns"][-1]["name"] == f"c{s3_connector.MAX_INFER_COLUMNS - 1}"
+
+@pytest.mark.asyncio
+async def test_discover_lists_nested_prefixes(s3_client, connector):
+    """
+    Tests that CSVs at the bucket root and under nested prefixes are all discovered.
+    """
+    for key in ("root.csv", "a/one.csv", "a/b/two.csv", "z/three.csv", "z/notes.txt"):
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=b"col\n1\n")
+
+    s3_objects = await connector.discover_s3_objects()
+
+    assert sorted(obj["key"] for obj in s3_objects) == ["a/b/two.csv", "a/one.csv", "root.csv", "z/three.csv"]
+    assert all(obj["schema_info"]["column_count"] == 1 for obj in s3_objects)
+
+@pytest.mark.asyncio
+async def test_discover_with_mocked_extraction(s3_client, connector):
+    """
+    Tests that discovery only relies on what metadata extraction returns.
+    """
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="file1.csv", Body=b"data")
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="dir/file2.csv", Body=b"data")
+    connector._extract_object_metadata = AsyncMock(return_value={"key": "mocked"})
+
+    s3_objects = await connector.discover_s3_objects()
+
+    assert len(s3_objects) == 2
+    assert connector._extract_object_metadata.call_count == 2
+
+@pytest.mark.asyncio
+async def test_discover_since_skips_unmodified_objects(s3_client, connector):
+    """
+    Tests that objects not modified after `since` are filtered out before extraction.
+    """
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="file.csv", Body=b"col\n1\n")
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="dir/file.csv", Body=b"col\n1\n")
+
+    recent = await connector.discover_s3_objects(since=datetime.now(timezone.utc) - timedelta(hours=1))
+    future = await connector.discover_s3_objects(since=datetime.now(timezone.utc) + timedelta(hours=1))
+
+    assert len(recent) == 2
+    assert future == []
+
+@pytest.mark.asyncio
+async def test_discover_reuses_cached_schemas(s3_client, connector):
+    """
+    Tests that unchanged objects (same ETag) reuse the cached schema instead of being sampled again.
+    """
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="file.csv", Body=b"col\n1\n")
+    first = await connector.discover_s3_objects()
+
+    connector._infer_csv_schema = AsyncMock()
+    second = await connector.discover_s3_objects()
+
+    connector._infer_csv_schema.assert_not_called()
+    assert second[0]["schema_info"] == first[0]["schema_info"]
+
+@pytest.mark.asyncio
+async def test_sampling_stops_using_select_once_unsupported(s3_client, connector):
+    """
+    Tests that an unsupported S3 Select is probed once and every object falls back to GET.
+    """
+    for i in range(5):
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=f"file{i}.csv", Body=b"col\n1\n")
+    select = select_not_supported(connector)
+
+    s3_objects = await connector.discover_s3_objects()
+
+    assert select.call_count == 1
+    assert all(obj["schema_info"]["columns"][0]["sample_values"] == [1] for obj in s3_objects)
+
+@pytest.mark.asyncio
+async def test_sampling_fallback_streams_only_the_sample(s3_client, connector, mocker):
+    """
+    Tests that the GET fallback stops after the sample rows and drops the trailing partial row.
+    """
+    body = b"id,value\n" + b"".join(b"%d,%d\n" % (i, i * 10) for i in range(10000))
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="big.csv", Body=body)
+    select_not_supported(connector)
+    mocker.patch("s3_connector.SCHEMA_STREAM_CHUNK_BYTES", 16)
+
+    raw_bytes = await connector._sample_csv_bytes("big.csv")
+
+    assert raw_bytes.endswith(b"\n")
+    assert body.startswith(raw_bytes)
+    assert s3_connector.SCHEMA_SAMPLE_ROWS < raw_bytes.count(b"\n") < 20
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import utils
+from utils import AtlanUtils, PerformanceMonitor, _dump_last_run, _parse_last_run
+
+@pytest.fixture
+def atlan_utils(mocker, tmp_path):
+    """AtlanUtils with a mocked Atlan client and a last-run file under tmp_path."""
+    mocker.patch("utils.get_atlan_client", return_value=MagicMock())
+    instance = AtlanUtils()
+    instance.last_run_file = str(tmp_path / "last_run_timestamp.txt")
+    return instance
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_last_run_round_trip(mocker, use_orjson):
+    """
+    Tests that a dumped last-run timestamp parses back unchanged, with and without orjson.
+    """
+    if not use_orjson:
+        mocker.patch("utils.orjson", None)
+    timestamp = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+    assert _parse_last_run(_dump_last_run(timestamp)) == timestamp
+
+def test_parse_last_run_accepts_legacy_format():
+    """
+    Tests that the older plain ISO timestamp file format is still read.
+    """
+    assert _parse_last_run(b"2024-01-02T03:04:05\n") == datetime(2024, 1, 2, 3, 4, 5)
+
+def test_last_run_timestamp_persists(atlan_utils):
+    """
+    Tests that update_last_run_timestamp writes a value get_last_run_timestamp reads back.
+    """
+    before = datetime.now()
+    asyncio.run(atlan_utils.update_last_run_timestamp())
+
+    assert before <= asyncio.run(atlan_utils.get_last_run_timestamp()) <= datetime.now()
+
+def test_last_run_timestamp_defaults_to_30_days(atlan_utils):
+    """
+    Tests that a missing last-run file falls back to 30 days ago.
+    """
+    last_run = asyncio.run(atlan_utils.get_last_run_timestamp())
+
+    assert abs((datetime.now() - timedelta(days=30)) - last_run) < timedelta(minutes=1)
+
+def test_performance_monitor_totals():
+    """
+    Tests that running totals cover every operation, including ones evicted from the ring buffer.
+    """
+    monitor = PerformanceMonitor(capacity=2)
+    for _ in range(3):
+        with monitor.measure("ok"):
+            pass
+    with pytest.raises(ValueError):
+        with monitor.measure("fails"):
+            raise ValueError("boom")
+
+    metrics = monitor.get_metrics()
+    assert metrics["total_operations"] == 4
+    assert metrics["failed_operations"] == 1
+    assert metrics["success_rate"] == 75.0
+    assert [m.operation for m in monitor.metrics] == ["ok", "fails"]
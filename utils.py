@@ -7,18 +7,26 @@ Provides common functionality, performance monitoring, and helper methods
 import logging
 import time
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-import os
+from dataclasses import dataclass
+from collections import deque
 from contextlib import contextmanager
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 from atlan_client import get_atlan_client
 
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Default number of retained metrics so long-running processes don't grow without limit
+MAX_RETAINED_METRICS = 100_000
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetric:
     """Performance metric data structure"""
     operation: str
@@ -32,20 +40,36 @@ class PerformanceMetric:
 class PerformanceMonitor:
     """Performance monitoring and metrics collection"""
 
-    def __init__(self):
-        self.metrics: List[PerformanceMetric] = []
+    def __init__(self, retain_metrics: bool = True, capacity: int = MAX_RETAINED_METRICS):
+        self.retain_metrics = retain_metrics
+        # Ring buffer: once full, each new metric evicts the oldest one
+        self.metrics: deque[PerformanceMetric] = deque(maxlen=capacity)
         self.active_operations: Dict[str, float] = {}
+        # Running totals so get_metrics doesn't rescan every recorded metric
+        self._total_ops = 0
+        self._success_ops = 0
+        self._total_duration = 0.0
+
+    def _record(self, metric: PerformanceMetric) -> None:
+        """Fold a finished operation into the running totals"""
+        self._total_ops += 1
+        self._total_duration += metric.duration
+        if metric.success:
+            self._success_ops += 1
+        if self.retain_metrics:
+            self.metrics.append(metric)
 
     @contextmanager
     def measure(self, operation_name: str, metadata: Optional[Dict[str, Any]] = None):
         """Context manager for measuring operation performance"""
         start_time = time.time()
+        start_ns = time.perf_counter_ns()
         self.active_operations[operation_name] = start_time
 
         try:
             yield
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            end_time = start_time + duration
             metric = PerformanceMetric(
                 operation=operation_name,
                 start_time=start_time,
@@ -54,12 +78,12 @@ class PerformanceMonitor:
                 success=True,
                 metadata=metadata,
             )
-            self.metrics.append(metric)
-            logger.info(f"Operation '{operation_name}' completed in {duration:.2f} seconds")
+            self._record(metric)
+            logger.info("Operation '%s' completed in %.2f seconds", operation_name, duration)
 
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            end_time = start_time + duration
             metric = PerformanceMetric(
                 operation=operation_name,
                 start_time=start_time,
@@ -69,8 +93,8 @@ class PerformanceMonitor:
                 error_message=str(e),
                 metadata=metadata,
             )
-            self.metrics.append(metric)
-            logger.error(f"Operation '{operation_name}' failed after {duration:.2f} seconds: {str(e)}")
+            self._record(metric)
+            logger.error("Operation '%s' failed after %.2f seconds: %s", operation_name, duration, e)
             raise
 
         finally:
@@ -79,14 +103,14 @@ class PerformanceMonitor:
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get comprehensive performance metrics"""
-        if not self.metrics:
+        if not self._total_ops:
             return {"total_operations": 0, "total_duration": 0, "success_rate": 0}
 
-        total_operations = len(self.metrics)
-        successful_operations = sum(1 for m in self.metrics if m.success)
-        total_duration = sum(m.duration for m in self.metrics)
-        average_duration = total_duration / total_operations if total_operations > 0 else 0
-        success_rate = (successful_operations / total_operations) * 100 if total_operations > 0 else 0
+        total_operations = self._total_ops
+        successful_operations = self._success_ops
+        total_duration = self._total_duration
+        average_duration = total_duration / total_operations
+        success_rate = (successful_operations / total_operations) * 100
 
         return {
             "total_operations": total_operations,
@@ -97,6 +121,20 @@ class PerformanceMonitor:
             "success_rate": success_rate,
         }
 
+def _dump_last_run(timestamp: datetime) -> bytes:
+    """Serialize the last run timestamp file contents"""
+    if orjson is not None:
+        return orjson.dumps({"last_run": timestamp})
+    return json.dumps({"last_run": timestamp.isoformat()}).encode()
+
+def _parse_last_run(content: bytes) -> datetime:
+    """Parse the last run timestamp file, accepting the older plain ISO format"""
+    content = content.strip()
+    if not content.startswith(b"{"):
+        return datetime.fromisoformat(content.decode())
+    data = orjson.loads(content) if orjson is not None else json.loads(content)
+    return datetime.fromisoformat(data["last_run"])
+
 class AtlanUtils:
     """Utility functions for Atlan operations"""
 
@@ -107,23 +145,21 @@ class AtlanUtils:
     async def get_last_run_timestamp(self) -> datetime:
         """Get the timestamp of the last successful run"""
         try:
-            if os.path.exists(self.last_run_file):
-                with open(self.last_run_file, 'r') as f:
-                    timestamp_str = f.read().strip()
-                    return datetime.fromisoformat(timestamp_str)
-            else:
-                return datetime.now() - timedelta(days=30)
+            with open(self.last_run_file, 'rb') as f:
+                return _parse_last_run(f.read())
+        except FileNotFoundError:
+            return datetime.now() - timedelta(days=30)
         except Exception as e:
-            logger.error(f"Failed to get last run timestamp: {str(e)}")
+            logger.error("Failed to get last run timestamp: %s", e)
             return datetime.now() - timedelta(days=30)
 
     async def update_last_run_timestamp(self) -> None:
         """Update the last run timestamp to current time"""
         try:
             current_time = datetime.now()
-            with open(self.last_run_file, 'w') as f:
-                f.write(current_time.isoformat())
-            logger.info(f"Updated last run timestamp to {current_time.isoformat()}")
+            with open(self.last_run_file, 'wb') as f:
+                f.write(_dump_last_run(current_time))
+            logger.info("Updated last run timestamp to %s", current_time.isoformat())
         except Exception as e:
-            logger.error(f"Failed to update last run timestamp: {str(e)}")
+            logger.error("Failed to update last run timestamp: %s", e)
 